@@ -1,5 +1,11 @@
 import pandas as pd
 from pathlib import Path
+from profiling import Profiler, parse_args
+
+
+args = parse_args('Clean the affordable housing data')
+profiler = Profiler('affordable', enabled=args.profile, cprofile=args.cprofile,
+                    trace_memory=args.trace_memory)
 
 
 base_dir = Path(__file__).parent 
@@ -10,20 +16,23 @@ if not file_path.exists():
     raise FileNotFoundError(f"Data file not found: {file_path.resolve()}")
 
 
-data_df = pd.read_excel(file_path, sheet_name=1)
-
+with profiler.stage('read_excel'):
+    data_df = pd.read_excel(file_path, sheet_name=1)
 
-data_df = data_df.iloc[:, 1:]  
 
+with profiler.stage('clean'):
+    data_df = data_df.iloc[:, 1:]  
 
-data_df.columns = [col.split('-')[0].strip() if '-' in str(col) else col for col in data_df.columns]
+    data_df.columns = [col.split('-')[0].strip() if '-' in str(col) else col for col in data_df.columns]
 
-
-cleaned_data_df = data_df.dropna(how='any').reset_index(drop=True)
+    cleaned_data_df = data_df.dropna(how='any').reset_index(drop=True)
 
 
 cleaned_file_path = base_dir / 'output' / 'cleaned_data_second_sheet_updated_years.xlsx'
 cleaned_file_path.parent.mkdir(exist_ok=True)  
-cleaned_data_df.to_excel(cleaned_file_path, index=False)
+with profiler.stage('to_excel'):
+    cleaned_data_df.to_excel(cleaned_file_path, index=False)
 
 print(f"Cleaned file saved to: {cleaned_file_path.resolve()}")
+
+profiler.write_report()
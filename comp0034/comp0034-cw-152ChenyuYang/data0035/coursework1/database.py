@@ -1,19 +1,36 @@
+import os
 import sqlite3
 import pandas as pd
 from pathlib import Path
+from profiling import Profiler, parse_args
 
 
 base_dir = Path(__file__).parent 
 file1_path = base_dir / 'output' / 'cleaned_data_second_sheet_updated_years.xlsx'
 file2_path = base_dir / 'output' / 'cleaned_final_result_waiting_list.xlsx'
 db_path = base_dir / 'database' / 'local_authority_housing.db'
+# The build writes here and then renames over db_path, so readers never see
+# a half-written database
+staging_path = db_path.with_name(db_path.name + '.staging')
 
 
 db_path.parent.mkdir(exist_ok=True)
 
-def create_database():
-    # Connect to SQLite database (creates a new one if it doesn't exist)
-    conn = sqlite3.connect(db_path)
+
+def discard_staging(conn):
+    # Leave the published database untouched if the build fails
+    conn.close()
+    staging_path.unlink(missing_ok=True)
+
+
+def create_database(profiler=None):
+    # Profiling is off unless a Profiler is passed in (see --profile)
+    if profiler is None:
+        profiler = Profiler('database')
+
+    # Build a fresh staging database next to the published one
+    staging_path.unlink(missing_ok=True)
+    conn = sqlite3.connect(staging_path)
     cursor = conn.cursor()
 
     # Step 1: Create the database tables based on the ERD
@@ -56,75 +73,91 @@ def create_database():
 
     # Step 2: Load data from Excel files
     try:
-        df1 = pd.read_excel(file1_path)
-        df2 = pd.read_excel(file2_path)
+        with profiler.stage('read_excel'):
+            df1 = pd.read_excel(file1_path)
+            df2 = pd.read_excel(file2_path)
         print(f"Data files loaded successfully:\n  - {file1_path}\n  - {file2_path}")
     except FileNotFoundError as e:
         print(f"Error: {e}")
+        discard_staging(conn)
         return
     except Exception as e:
         print(f"Unexpected error while reading files: {e}")
+        discard_staging(conn)
         return
 
     # Step 3: Prepare and normalize the data
     # Normalize Area data
-    area_data = pd.concat([
-        df1[['Current\nONS code', 'Area name']].rename(columns={
-            'Current\nONS code': 'area_code',
-            'Area name': 'area_name'
-        }),
-        df2[['Current ONS Code', 'Area name']].rename(columns={
-            'Current ONS Code': 'area_code',
-            'Area name': 'area_name'
-        })
-    ]).drop_duplicates()
+    with profiler.stage('normalize_area'):
+        area_data = pd.concat([
+            df1[['Current\nONS code', 'Area name']].rename(columns={
+                'Current\nONS code': 'area_code',
+                'Area name': 'area_name'
+            }),
+            df2[['Current ONS Code', 'Area name']].rename(columns={
+                'Current ONS Code': 'area_code',
+                'Area name': 'area_name'
+            })
+        ]).drop_duplicates()
 
     # Normalize Year data
-    years = pd.concat([
-        pd.melt(df1, id_vars=['Current\nONS code', 'Area name'], var_name='year', value_name='housing_units')['year'],
-        pd.melt(df2, id_vars=['Current ONS Code', 'Area name'], var_name='year', value_name='households_count')['year']
-    ]).drop_duplicates().astype(int)
+    with profiler.stage('melt_years'):
+        years = pd.concat([
+            pd.melt(df1, id_vars=['Current\nONS code', 'Area name'], var_name='year', value_name='housing_units')['year'],
+            pd.melt(df2, id_vars=['Current ONS Code', 'Area name'], var_name='year', value_name='households_count')['year']
+        ]).drop_duplicates().astype(int)
 
     # Prepare Affordable Housing Data
-    affordable_housing_data = pd.melt(
-        df1, id_vars=['Current\nONS code', 'Area name'], var_name='year', value_name='housing_units'
-    ).rename(columns={
-        'Current\nONS code': 'area_code',
-        'Area name': 'area_name'
-    }).dropna(subset=['housing_units'])
+    with profiler.stage('melt_affordable_housing'):
+        affordable_housing_data = pd.melt(
+            df1, id_vars=['Current\nONS code', 'Area name'], var_name='year', value_name='housing_units'
+        ).rename(columns={
+            'Current\nONS code': 'area_code',
+            'Area name': 'area_name'
+        }).dropna(subset=['housing_units'])
 
     # Prepare Waiting List Data
-    waiting_list_data = pd.melt(
-        df2, id_vars=['Current ONS Code', 'Area name'], var_name='year', value_name='households_count'
-    ).rename(columns={
-        'Current ONS Code': 'area_code',
-        'Area name': 'area_name'
-    }).dropna(subset=['households_count'])
+    with profiler.stage('melt_waiting_list'):
+        waiting_list_data = pd.melt(
+            df2, id_vars=['Current ONS Code', 'Area name'], var_name='year', value_name='households_count'
+        ).rename(columns={
+            'Current ONS Code': 'area_code',
+            'Area name': 'area_name'
+        }).dropna(subset=['households_count'])
 
     # Step 4: Insert data into the database
     try:
-        # Insert Area data
-        area_data.to_sql('Area', conn, if_exists='replace', index=False)
+        with profiler.stage('to_sql'):
+            # Insert Area data
+            area_data.to_sql('Area', conn, if_exists='replace', index=False)
 
-        # Insert Year data
-        pd.DataFrame(years, columns=['year']).to_sql('Year', conn, if_exists='replace', index=False)
+            # Insert Year data
+            pd.DataFrame(years, columns=['year']).to_sql('Year', conn, if_exists='replace', index=False)
 
-        # Insert Affordable Housing Data
-        affordable_housing_data[['area_code', 'year', 'housing_units']].to_sql(
-            'Affordable_Housing_Data', conn, if_exists='replace', index=False
-        )
+            # Insert Affordable Housing Data
+            affordable_housing_data[['area_code', 'year', 'housing_units']].to_sql(
+                'Affordable_Housing_Data', conn, if_exists='replace', index=False
+            )
 
-        # Insert Waiting List Data
-        waiting_list_data[['area_code', 'year', 'households_count']].to_sql(
-            'Waiting_List_Data', conn, if_exists='replace', index=False
-        )
+            # Insert Waiting List Data
+            waiting_list_data[['area_code', 'year', 'households_count']].to_sql(
+                'Waiting_List_Data', conn, if_exists='replace', index=False
+            )
+
+        conn.commit()
+        conn.close()
+
+        # Step 5: Publish the new database with an atomic rename
+        os.replace(staging_path, db_path)
 
         print(f"Database created successfully and data inserted into: {db_path}")
     except Exception as e:
         print(f"Error while inserting data into the database: {e}")
-    finally:
-        # Close the connection
-        conn.close()
+        discard_staging(conn)
 
 if __name__ == "__main__":
-    create_database()
+    args = parse_args('Build the local authority housing database')
+    profiler = Profiler('database', enabled=args.profile, cprofile=args.cprofile,
+                        trace_memory=args.trace_memory)
+    create_database(profiler)
+    profiler.write_report()
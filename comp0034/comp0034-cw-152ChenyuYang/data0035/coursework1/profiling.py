@@ -0,0 +1,216 @@
+import argparse
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+base_dir = Path(__file__).parent
+profile_dir = base_dir / 'output' / 'profile'
+
+# Number of tracemalloc allocators kept per stage
+TOP_ALLOCATORS = 10
+
+# How often the RSS of a running stage is sampled (seconds)
+RSS_SAMPLE_INTERVAL = 0.005
+
+# Ignore memory used by tracemalloc itself and by imports
+SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+]
+
+
+def parse_args(description, argv=None):
+    """Parse the shared profiling options of the ETL scripts."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--profile', action='store_true',
+                        help='record per-stage wall time and RSS')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='also record tracemalloc top allocators, implies --profile '
+                             '(slows the stages down, so run it separately from timing runs)')
+    parser.add_argument('--cprofile', action='store_true',
+                        help='also dump a cProfile file per stage, implies --profile '
+                             '(also slows the stages down)')
+    args = parser.parse_args(argv)
+
+    # The detailed options are useless without a report to put them in
+    args.profile = args.profile or args.trace_memory or args.cprofile
+    return args
+
+
+def current_rss():
+    """Current resident set size of this process in bytes, or None if unknown."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def process_peak_rss():
+    """Highest RSS the process has reached so far (cumulative), or None."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS reports bytes
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+    if psutil is None:
+        return None
+    memory = psutil.Process().memory_info()
+    return getattr(memory, 'peak_wset', memory.rss)
+
+
+class RssSampler:
+    """Samples the RSS in a background thread and keeps the highest value.
+
+    ru_maxrss only ever grows over the life of the process, so it cannot
+    tell which stage reached the peak; sampling while a stage runs can.
+    """
+
+    def __init__(self, interval=RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak = current_rss()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._update(current_rss())
+
+    def _update(self, rss):
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop sampling and return the peak RSS in bytes, or None if unknown."""
+        self._stop.set()
+        self._thread.join()
+        self._update(current_rss())
+        return self.peak
+
+
+class Profiler:
+    """Collects per-stage measurements for one ETL script.
+
+    When disabled, ``stage()`` does nothing, so the scripts can wrap their
+    steps unconditionally. tracemalloc and cProfile only run when asked for,
+    because both inflate the wall times they would be reported next to.
+    """
+
+    def __init__(self, name, enabled=False, cprofile=False, trace_memory=False):
+        self.name = name
+        self.enabled = enabled
+        self.cprofile = enabled and cprofile
+        self.trace_memory = enabled and trace_memory
+        self.stages = []
+
+        if self.trace_memory:
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, stage_name):
+        if not self.enabled:
+            yield
+            return
+
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        profiler = cProfile.Profile() if self.cprofile else None
+        rss_start = current_rss()
+        sampler = RssSampler().start()
+        start = time.perf_counter()
+
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            wall_time = time.perf_counter() - start
+            peak_rss = sampler.stop()
+            rss_end = current_rss()
+
+            record = {
+                'stage': stage_name,
+                'wall_time_s': round(wall_time, 6),
+                'rss_start_bytes': rss_start,
+                'rss_end_bytes': rss_end,
+                # Highest RSS sampled while this stage ran
+                'peak_rss_bytes': peak_rss,
+            }
+
+            if self.trace_memory:
+                after = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+                _, traced_peak = tracemalloc.get_traced_memory()
+                top = after.compare_to(before, 'lineno')[:TOP_ALLOCATORS]
+
+                record['traced_peak_bytes'] = traced_peak
+                record['top_allocators'] = [
+                    {
+                        'location': f'{stat.traceback[0].filename}:{stat.traceback[0].lineno}',
+                        'size_diff_bytes': stat.size_diff,
+                        'count_diff': stat.count_diff,
+                    }
+                    for stat in top
+                ]
+
+            if profiler is not None:
+                profile_dir.mkdir(parents=True, exist_ok=True)
+                dump_path = profile_dir / f'{self.name}.{stage_name}.prof'
+                profiler.dump_stats(dump_path)
+                record['cprofile'] = str(dump_path)
+
+            self.stages.append(record)
+
+    def write_report(self):
+        """Write the collected stages to output/profile/<name>.json."""
+        if not self.enabled:
+            return None
+
+        if self.trace_memory:
+            tracemalloc.stop()
+        profile_dir.mkdir(parents=True, exist_ok=True)
+
+        # Traced runs get their own file so they never overwrite timing runs
+        suffix = '.memory' if self.trace_memory else ''
+        report_path = profile_dir / f'{self.name}{suffix}.json'
+
+        report = {
+            'script': self.name,
+            # Wall times are only comparable across runs with the same flags
+            'tracemalloc': self.trace_memory,
+            'cprofile': self.cprofile,
+            'total_wall_time_s': round(sum(s['wall_time_s'] for s in self.stages), 6),
+            'process_peak_rss_bytes': process_peak_rss(),
+            'stages': self.stages,
+        }
+        report_path.write_text(json.dumps(report, indent=2))
+
+        print(f"Profile report saved to: {report_path.resolve()}")
+        return report_path
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+
+# Window of the moving average (years)
+MOVING_AVERAGE_WINDOW = 3
+
+# How many years the linear trend is projected beyond the data
+FORECAST_HORIZON = 5
+
+# **Extra data types offered by the line and bar chart dropdowns**
+TREND_OPTIONS = {
+    "moving_avg": f"{MOVING_AVERAGE_WINDOW}-Year Moving Average",
+    "cagr": "Compound Annual Growth (%)",
+    "forecast": f"Linear Trend ({FORECAST_HORIZON}-Year Projection)",
+}
+
+
+def build_matrix(df, value_col):
+    """Pivot a fact table into a dense (areas x years) float matrix.
+
+    Missing (area, year) pairs are NaN. Area codes and years come back
+    sorted.
+    """
+    area_idx, codes = pd.factorize(df["area_code"], sort=True)
+    year_idx, years = pd.factorize(df["year"], sort=True)
+    codes = codes.to_numpy(dtype=str)
+    years = years.to_numpy(dtype=int)
+
+    matrix = np.full((len(codes), len(years)), np.nan)
+    matrix[area_idx, year_idx] = df[value_col].to_numpy(dtype=float)
+
+    return codes, years, matrix
+
+
+def moving_average(matrix, window=MOVING_AVERAGE_WINDOW):
+    """Trailing moving average over the last ``window`` years, ignoring NaNs."""
+    valid = ~np.isnan(matrix)
+    zeros = np.zeros((matrix.shape[0], 1))
+
+    sums = np.concatenate([zeros, np.cumsum(np.where(valid, matrix, 0.0), axis=1)], axis=1)
+    counts = np.concatenate([zeros, np.cumsum(valid, axis=1)], axis=1)
+
+    end = np.arange(1, matrix.shape[1] + 1)
+    start = np.maximum(end - window, 0)
+    window_sums = sums[:, end] - sums[:, start]
+    window_counts = counts[:, end] - counts[:, start]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(window_counts > 0, window_sums / window_counts, np.nan)
+
+
+def compound_growth(matrix, years):
+    """Compound annual growth (%) from each area's first positive value.
+
+    Growth from zero is undefined, so leading zeros are skipped.
+    """
+    valid = ~np.isnan(matrix)
+    rows = np.arange(matrix.shape[0])
+
+    with np.errstate(invalid="ignore"):
+        positive = valid & (matrix > 0)
+    first = np.argmax(positive, axis=1)
+    first_value = np.where(positive.any(axis=1), matrix[rows, first], np.nan)
+    elapsed = years[np.newaxis, :] - years[first][:, np.newaxis]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratio = matrix / first_value[:, np.newaxis]
+        growth = (np.power(ratio, 1.0 / elapsed) - 1.0) * 100
+
+    usable = valid & (elapsed > 0) & (first_value[:, np.newaxis] > 0) & (ratio >= 0)
+    return np.where(usable, growth, np.nan)
+
+
+def linear_trend(matrix, years, horizon=FORECAST_HORIZON):
+    """Least-squares trend per area, evaluated on the data years plus ``horizon``.
+
+    Areas with fewer than two values get NaN.
+    """
+    valid = ~np.isnan(matrix)
+    values = np.where(valid, matrix, 0.0)
+    x = years.astype(float) - years[0]
+
+    n = valid.sum(axis=1)
+    sum_x = (valid * x).sum(axis=1)
+    sum_y = values.sum(axis=1)
+    sum_xx = (valid * x**2).sum(axis=1)
+    sum_xy = (values * x).sum(axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = (n * sum_xy - sum_x * sum_y) / (n * sum_xx - sum_x**2)
+        intercept = (sum_y - slope * sum_x) / n
+
+    slope[n < 2] = np.nan
+
+    trend_years = np.concatenate([years, years[-1] + np.arange(1, horizon + 1)])
+    trend_x = trend_years.astype(float) - years[0]
+    trend = intercept[:, np.newaxis] + slope[:, np.newaxis] * trend_x
+
+    return trend_years, trend
+
+
+class TrendMetrics:
+    """Moving average, compound growth and linear trend for every area.
+
+    All metrics are computed once, in a single NumPy pass over the dense
+    matrix; ``frame()`` only slices out the rows for the selected areas.
+    """
+
+    def __init__(self, df, value_col):
+        self.value_col = value_col
+        self.codes, self.years, matrix = build_matrix(df, value_col)
+        self.row_of = {code: i for i, code in enumerate(self.codes)}
+
+        self.metrics = {
+            "moving_avg": (self.years, moving_average(matrix)),
+            "cagr": (self.years, compound_growth(matrix, self.years)),
+            "forecast": linear_trend(matrix, self.years),
+        }
+
+    def frame(self, metric, selected_areas):
+        """Long (area_code, year, value_col) DataFrame for the selected areas."""
+        years, values = self.metrics[metric]
+
+        selected = [a for a in selected_areas if a in self.row_of]
+        rows = [self.row_of[a] for a in selected]
+
+        return pd.DataFrame(
+            {
+                "area_code": np.repeat(selected, len(years)),
+                "year": np.tile(years, len(selected)),
+                self.value_col: values[rows].ravel(),
+            }
+        ).dropna(subset=[self.value_col])
+
@@ -1,10 +1,19 @@
 import dash
-from dash import dcc, html, Input, Output
+from dash import dcc, html, Input, Output, State
 import dash_bootstrap_components as dbc
 import plotly.express as px
 import sqlite3
 import pandas as pd
 import os
+import threading
+from collections import namedtuple
+from contextlib import closing
+from functools import partial
+from pathlib import Path
+from job_queue import create_job_manager
+from area_search import AreaIndex
+from figure_store import FigureStore, record_request
+from analytics import TREND_OPTIONS, TrendMetrics
 
 # Get the directory where app.py is located
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -22,9 +31,17 @@ if not os.path.exists(geo_path):
     raise FileNotFoundError(f" File not found: {geo_path}")
 
 
+# **Open the database read-only**
+# database.py publishes a new file with an atomic rename and never writes to
+# the live file, so readers can treat it as immutable and skip locking.
+def connect_readonly():
+    uri = Path(db_path).resolve().as_uri() + "?mode=ro&immutable=1"
+    return closing(sqlite3.connect(uri, uri=True))
+
+
 # **Read database data**
 def load_data():
-    with sqlite3.connect(db_path) as conn:
+    with connect_readonly() as conn:
         df_housing = pd.read_sql_query("SELECT * FROM Affordable_Housing_Data", conn)
         df_waiting = pd.read_sql_query("SELECT * FROM Waiting_List_Data", conn)
 
@@ -34,149 +51,298 @@ def load_data():
     return df_housing, df_waiting
 
 
-df_housing, df_waiting = load_data()
+# **Read area codes and names for the area search index**
+def load_areas():
+    with connect_readonly() as conn:
+        return pd.read_sql_query("SELECT area_code, area_name FROM Area", conn)
+
+
+# **Data version: changes whenever database.py rebuilds the database**
+def data_version():
+    return str(os.stat(db_path).st_mtime_ns)
+
 
 # **Read longitude and latitude data**
 df_geo = pd.read_csv(geo_path)
 
-# **COMBINING HOUSING DATA AND LATITUDE AND LONGITUDE DATA**
-df_housing = df_housing.merge(df_geo, on="area_code", how="left")
+
+# **Everything loaded from one version of the database**
+# Published as a single object so callbacks never mix two versions
+DataSnapshot = namedtuple(
+    "DataSnapshot",
+    [
+        "version",
+        "df_housing",
+        "df_waiting",
+        "area_index",
+        "prerendered",
+        "default_areas",
+        "trends",
+    ],
+)
+
+
+# **Load everything that depends on the database**
+def load_snapshot():
+    # Read the version first: if the file is replaced while loading, the
+    # next check sees a newer version and loads again
+    version = data_version()
+    df_housing, df_waiting = load_data()
+
+    # **COMBINING HOUSING DATA AND LATITUDE AND LONGITUDE DATA**
+    df_housing = df_housing.merge(df_geo, on="area_code", how="left")
+
+    return DataSnapshot(
+        version=version,
+        df_housing=df_housing,
+        df_waiting=df_waiting,
+        # **Search index for the area dropdown (options are served by a callback)**
+        area_index=AreaIndex(load_areas()),
+        # **Figures prerendered by prerender.py for this data version**
+        prerendered=FigureStore(version),
+        # **A region is selected by default**
+        default_areas=[df_housing["area_code"].unique()[0]],
+        # **Trend metrics for every area, computed once per data version**
+        trends={
+            "households_count": TrendMetrics(df_waiting, "households_count"),
+            "housing_units": TrendMetrics(df_housing, "housing_units"),
+        },
+    )
+
+
+current_data = load_snapshot()
+
+
+# **Version of the data currently held in memory**
+def current_version():
+    return current_data.version
+
 
 # **Using Bootstrap Themes**
 external_stylesheets = [dbc.themes.BOOTSTRAP]
 
+# **Background job manager for the expensive callbacks**
+background_callback_manager = create_job_manager(current_version)
+
 # **Creating Dash Apps**
-app = dash.Dash(__name__, external_stylesheets=external_stylesheets)
+app = dash.Dash(
+    __name__,
+    external_stylesheets=external_stylesheets,
+    background_callback_manager=background_callback_manager,
+)
 
-# **Get area_code option**
-area_options = [
-    {"label": area, "value": area} for area in df_housing["area_code"].unique()
-]
 
 # **APP LAYOUT**
-app.layout = dbc.Container(
-    [
-        # **title**
-        dbc.Row(
-            [
-                dbc.Col(
-                    html.H1(
-                        " Housing Supply & Demand Visualization",
-                        className="text-center",
-                    ),
-                    width=12,
-                )
-            ],
-            className="mb-3",
-        ),
-        dbc.Row(
-            [
-                dbc.Col(
-                    html.P(
-                        "Select area codes to compare housing supply and waiting list trends over time.",
-                        className="text-center",
-                    ),
-                    width=12,
-                )
-            ],
-            className="mb-3",
-        ),
-        # **Selection box**
-        dbc.Row(
-            [
-                dbc.Col(
-                    [
-                        html.Label("Select Area Codes:", className="fw-bold"),
-                        dcc.Dropdown(
-                            id="area-dropdown",
-                            options=area_options,
-                            value=[
-                                df_housing["area_code"].unique()[0]
-                            ],  # A region is selected by default
-                            multi=True,
-                            clearable=False,
-                            className="mb-3",
-                        ),
-                    ],
-                    width=6,
-                ),
-            ],
-            className="mb-4",
-        ),
-        # **Two independent data type selection boxes**
-        dbc.Row(
-            [
-                dbc.Col(
-                    [
-                        html.Label(
-                            "Select Data Type for Line Chart:", className="fw-bold"
+# Built for one data snapshot, with its default figures embedded so the
+# first paint needs no callback round trips
+def build_layout(data, figures):
+    return dbc.Container(
+        [
+            # **title**
+            dbc.Row(
+                [
+                    dbc.Col(
+                        html.H1(
+                            " Housing Supply & Demand Visualization",
+                            className="text-center",
                         ),
-                        dcc.Dropdown(
-                            id="line-data-dropdown",
-                            options=[
-                                {"label": "Total Households", "value": "total"},
-                                {"label": "Percentage Change", "value": "pct_change"},
-                                {"label": "Normalized", "value": "normalized"},
-                            ],
-                            value="total",
-                            clearable=False,
-                            className="mb-3",
+                        width=12,
+                    )
+                ],
+                className="mb-3",
+            ),
+            dbc.Row(
+                [
+                    dbc.Col(
+                        html.P(
+                            "Select area codes to compare housing supply and waiting list trends over time.",
+                            className="text-center",
                         ),
-                    ],
-                    width=6,
-                ),
-                dbc.Col(
-                    [
-                        html.Label(
-                            "Select Data Type for Bar Chart:", className="fw-bold"
+                        width=12,
+                    )
+                ],
+                className="mb-3",
+            ),
+            # **Selection box**
+            dbc.Row(
+                [
+                    dbc.Col(
+                        [
+                            html.Label("Select Area Codes:", className="fw-bold"),
+                            dcc.Dropdown(
+                                id="area-dropdown",
+                                options=data.area_index.options_for(data.default_areas),
+                                value=data.default_areas,
+                                placeholder="Search by area name or code...",
+                                # Keep the server's ranking of the search results
+                                search_order="original",
+                                multi=True,
+                                clearable=False,
+                                className="mb-3",
+                            ),
+                        ],
+                        width=6,
+                    ),
+                ],
+                className="mb-4",
+            ),
+            # **Two independent data type selection boxes**
+            dbc.Row(
+                [
+                    dbc.Col(
+                        [
+                            html.Label(
+                                "Select Data Type for Line Chart:", className="fw-bold"
+                            ),
+                            dcc.Dropdown(
+                                id="line-data-dropdown",
+                                options=[
+                                    {"label": "Total Households", "value": "total"},
+                                    {
+                                        "label": "Percentage Change",
+                                        "value": "pct_change",
+                                    },
+                                    {"label": "Normalized", "value": "normalized"},
+                                ]
+                                + [
+                                    {"label": label, "value": value}
+                                    for value, label in TREND_OPTIONS.items()
+                                ],
+                                value="total",
+                                clearable=False,
+                                className="mb-3",
+                            ),
+                        ],
+                        width=6,
+                    ),
+                    dbc.Col(
+                        [
+                            html.Label(
+                                "Select Data Type for Bar Chart:", className="fw-bold"
+                            ),
+                            dcc.Dropdown(
+                                id="bar-data-dropdown",
+                                options=[
+                                    {"label": "Total Housing Units", "value": "total"},
+                                    {
+                                        "label": "Percentage Change",
+                                        "value": "pct_change",
+                                    },
+                                    {"label": "Normalized", "value": "normalized"},
+                                ]
+                                + [
+                                    {"label": label, "value": value}
+                                    for value, label in TREND_OPTIONS.items()
+                                ],
+                                value="total",
+                                clearable=False,
+                                className="mb-3",
+                            ),
+                        ],
+                        width=6,
+                    ),
+                ],
+                className="mb-4",
+            ),
+            # **chart**
+            dbc.Row(
+                [
+                    dbc.Col(
+                        dcc.Graph(
+                            id="waiting-line-chart",
+                            figure=figures["waiting-line-chart"],
                         ),
-                        dcc.Dropdown(
-                            id="bar-data-dropdown",
-                            options=[
-                                {"label": "Total Housing Units", "value": "total"},
-                                {"label": "Percentage Change", "value": "pct_change"},
-                                {"label": "Normalized", "value": "normalized"},
-                            ],
-                            value="total",
-                            clearable=False,
-                            className="mb-3",
+                        width=6,
+                    ),
+                    dbc.Col(
+                        [
+                            dbc.Progress(
+                                id="housing-bar-progress",
+                                value=0,
+                                max=3,
+                                style={"visibility": "hidden"},
+                            ),
+                            dcc.Graph(
+                                id="housing-bar-chart",
+                                figure=figures["housing-bar-chart"],
+                            ),
+                        ],
+                        width=6,
+                    ),
+                ],
+                className="mb-4",
+            ),
+            # **Map (scatter plot)**
+            dbc.Row(
+                [
+                    dbc.Col(
+                        [
+                            dbc.Progress(
+                                id="housing-map-progress",
+                                value=0,
+                                max=3,
+                                style={"visibility": "hidden"},
+                            ),
+                            dcc.Graph(id="housing-map", figure=figures["housing-map"]),
+                        ],
+                        width=6,
+                    ),
+                    dbc.Col(
+                        dcc.Graph(
+                            id="housing-pie-chart", figure=figures["housing-pie-chart"]
                         ),
-                    ],
-                    width=6,
-                ),
-            ],
-            className="mb-4",
-        ),
-        # **chart**
-        dbc.Row(
-            [
-                dbc.Col(dcc.Graph(id="waiting-line-chart"), width=6),
-                dbc.Col(dcc.Graph(id="housing-bar-chart"), width=6),
-            ],
-            className="mb-4",
-        ),
-        # **Map (scatter plot)**
-        dbc.Row(
-            [
-                dbc.Col(dcc.Graph(id="housing-map"), width=6),
-                dbc.Col(dcc.Graph(id="housing-pie-chart"), width=6),
-            ],
-            className="mb-4",
-        ),
-    ],
-    fluid=True,
+                        width=6,
+                    ),
+                ],
+                className="mb-4",
+            ),
+        ],
+        fluid=True,
+    )
+
+
+# **Area dropdown options: search the index on the server**
+@app.callback(
+    Output("area-dropdown", "options"),
+    Input("area-dropdown", "search_value"),
+    State("area-dropdown", "value"),
 )
 
 
+def update_area_options(search_value, selected_areas):
+    area_index = current_data.area_index
+    selected_areas = selected_areas or []
+
+    # Keep the selected areas in the options so their labels stay visible
+    options = area_index.options_for(selected_areas)
+    options += [
+        option
+        for option in area_index.search(search_value)
+        if option["value"] not in selected_areas
+    ]
+
+    # The browser filters options by value, label and "search"; matching the
+    # typed text keeps fuzzy matches (typos, mixed name/code) from being dropped
+    return [dict(option, search=search_value or "") for option in options]
+
+
 # **Waiting List Line Chart**
 @app.callback(
     Output("waiting-line-chart", "figure"),
     [Input("area-dropdown", "value"), Input("line-data-dropdown", "value")],
+    prevent_initial_call=True,
 )
 
 
-def update_waiting_chart(selected_areas, data_type):
-    filtered_df = df_waiting[df_waiting["area_code"].isin(selected_areas)].copy()
+def update_waiting_chart(selected_areas, data_type, data=None):
+    data = data or current_data
+    fig = data.prerendered.get("waiting-line-chart", [selected_areas, data_type])
+    if fig is not None:
+        return fig
+
+    filtered_df = data.df_waiting[
+        data.df_waiting["area_code"].isin(selected_areas)
+    ].copy()
 
     if data_type == "pct_change":
         filtered_df["households_count"] = (
@@ -188,6 +354,9 @@ def update_waiting_chart(selected_areas, data_type):
             "households_count"
         ].transform(lambda x: (x - x.min()) / (x.max() - x.min()))
         y_label = "Normalized Value"
+    elif data_type in TREND_OPTIONS:
+        filtered_df = data.trends["households_count"].frame(data_type, selected_areas)
+        y_label = TREND_OPTIONS[data_type]
     else:
         y_label = "Total Households"
 
@@ -204,14 +373,38 @@ def update_waiting_chart(selected_areas, data_type):
 
 
 # **HOUSING SUPPLY HISTOCRAFT**
+# Runs as a background job: a new selection cancels the running one
 @app.callback(
     Output("housing-bar-chart", "figure"),
     [Input("area-dropdown", "value"), Input("bar-data-dropdown", "value")],
+    background=True,
+    progress=[
+        Output("housing-bar-progress", "value"),
+        Output("housing-bar-progress", "max"),
+    ],
+    running=[
+        (
+            Output("housing-bar-progress", "style"),
+            {"visibility": "visible"},
+            {"visibility": "hidden"},
+        ),
+    ],
+    cancel=[Input("area-dropdown", "value"), Input("bar-data-dropdown", "value")],
+    prevent_initial_call=True,
 )
 
 
-def update_housing_chart(selected_areas, data_type):
-    filtered_df = df_housing[df_housing["area_code"].isin(selected_areas)].copy()
+def update_housing_chart(set_progress, selected_areas, data_type, data=None):
+    data = data or current_data
+    fig = data.prerendered.get("housing-bar-chart", [selected_areas, data_type])
+    if fig is not None:
+        return fig
+
+    set_progress((0, 3))
+    filtered_df = data.df_housing[
+        data.df_housing["area_code"].isin(selected_areas)
+    ].copy()
+    set_progress((1, 3))
 
     if data_type == "pct_change":
         filtered_df["housing_units"] = (
@@ -223,8 +416,12 @@ def update_housing_chart(selected_areas, data_type):
             "housing_units"
         ].transform(lambda x: (x - x.min()) / (x.max() - x.min()))
         y_label = "Normalized Value"
+    elif data_type in TREND_OPTIONS:
+        filtered_df = data.trends["housing_units"].frame(data_type, selected_areas)
+        y_label = TREND_OPTIONS[data_type]
     else:
         y_label = "Total Housing Units"
+    set_progress((2, 3))
 
     fig = px.bar(
         filtered_df,
@@ -234,18 +431,44 @@ def update_housing_chart(selected_areas, data_type):
         title="Housing Supply Over Time",
         labels={"housing_units": y_label, "year": "Year"},
     )
+    set_progress((3, 3))
 
     return fig
 
 
 # **HOUSING SUPPLY MAP**
-@app.callback(Output("housing-map", "figure"), [Input("area-dropdown", "value")])
+# Runs as a background job: a new selection cancels the running one
+@app.callback(
+    Output("housing-map", "figure"),
+    [Input("area-dropdown", "value")],
+    background=True,
+    progress=[
+        Output("housing-map-progress", "value"),
+        Output("housing-map-progress", "max"),
+    ],
+    running=[
+        (
+            Output("housing-map-progress", "style"),
+            {"visibility": "visible"},
+            {"visibility": "hidden"},
+        ),
+    ],
+    cancel=[Input("area-dropdown", "value")],
+    prevent_initial_call=True,
+)
 
 
-def update_map(selected_areas):
-    filtered_df = df_housing[df_housing["area_code"].isin(selected_areas)].dropna(
-        subset=["latitude", "longitude"]
-    )
+def update_map(set_progress, selected_areas, data=None):
+    data = data or current_data
+    fig = data.prerendered.get("housing-map", [selected_areas])
+    if fig is not None:
+        return fig
+
+    set_progress((0, 3))
+    filtered_df = data.df_housing[
+        data.df_housing["area_code"].isin(selected_areas)
+    ].dropna(subset=["latitude", "longitude"])
+    set_progress((1, 3))
 
     if filtered_df.empty:
         return px.scatter_geo(title="No Data Available for Selected Areas")
@@ -261,6 +484,7 @@ def update_map(selected_areas):
         title="Housing Supply Distribution",
         hover_data=["area_name"],  # Added area name to hover info
     )
+    set_progress((2, 3))
 
     # Center the map on London coordinates
     fig.update_geos(
@@ -273,18 +497,29 @@ def update_map(selected_areas):
         showocean=True,
         oceancolor="lightblue",
     )
+    set_progress((3, 3))
 
     return fig
 
 
 # **HOUSING SUPPLY PIE CHART**
-@app.callback(Output("housing-pie-chart", "figure"), [Input("area-dropdown", "value")])
+@app.callback(
+    Output("housing-pie-chart", "figure"),
+    [Input("area-dropdown", "value")],
+    prevent_initial_call=True,
+)
 
 
-def update_pie_chart(selected_areas):
+def update_pie_chart(selected_areas, data=None):
+    data = data or current_data
+    fig = data.prerendered.get("housing-pie-chart", [selected_areas])
+    if fig is not None:
+        return fig
 
     # SCREENING DATA
-    filtered_df = df_housing[df_housing["area_code"].isin(selected_areas)].copy()
+    filtered_df = data.df_housing[
+        data.df_housing["area_code"].isin(selected_areas)
+    ].copy()
 
     # **If the data is empty, return prompt**
     if filtered_df.empty:
@@ -323,6 +558,100 @@ def update_pie_chart(selected_areas):
     return fig
 
 
+# **Count selections so prerender.py can prerender the most requested ones**
+@app.callback(
+    [
+        Input("area-dropdown", "value"),
+        Input("line-data-dropdown", "value"),
+        Input("bar-data-dropdown", "value"),
+    ],
+    prevent_initial_call=True,
+)
+
+
+def count_selection(selected_areas, line_type, bar_type):
+    record_request([selected_areas, line_type, bar_type])
+
+
+# **Callback arguments of every figure for one dashboard selection**
+def figure_args(selected_areas, line_type, bar_type):
+    return {
+        "waiting-line-chart": [selected_areas, line_type],
+        "housing-bar-chart": [selected_areas, bar_type],
+        "housing-map": [selected_areas],
+        "housing-pie-chart": [selected_areas],
+    }
+
+
+def no_progress(progress):
+    pass
+
+
+# **Build a figure outside a callback (background jobs get a no-op progress)**
+# Pass ``data=`` to render from a snapshot that is not published yet
+figure_renderers = {
+    "waiting-line-chart": update_waiting_chart,
+    "housing-bar-chart": partial(update_housing_chart, no_progress),
+    "housing-map": partial(update_map, no_progress),
+    "housing-pie-chart": update_pie_chart,
+}
+
+
+# **Layout of one snapshot, with its default dashboard state**
+def render_layout(data):
+    figures = {
+        figure_id: figure_renderers[figure_id](*args, data=data)
+        for figure_id, args in figure_args(data.default_areas, "total", "total").items()
+    }
+    return build_layout(data, figures)
+
+
+current_layout = render_layout(current_data)
+
+
+# **Dash calls this on every page load**
+# A reload builds a new layout and swaps it in with one assignment, so the
+# layout being served is never modified
+def serve_layout():
+    return current_layout
+
+
+app.layout = serve_layout
+
+refresh_lock = threading.Lock()
+
+# Version whose reload failed, so it is not retried on every request
+failed_version = None
+
+
+# **Hot-swap the data when database.py publishes a new version**
+@app.server.before_request
+def reload_if_changed():
+    global current_data, current_layout, failed_version
+
+    version = data_version()
+    if version in (current_data.version, failed_version):
+        return
+
+    # One request reloads; the others keep serving the current data
+    if not refresh_lock.acquire(blocking=False):
+        return
+    try:
+        if data_version() != current_data.version:
+            data = load_snapshot()
+            layout = render_layout(data)
+
+            current_data = data
+            current_layout = layout
+            print(f" Reloaded data version {data.version}")
+    except Exception as e:
+        # Keep serving the loaded version until the database is fixed
+        failed_version = version
+        print(f" Reload of data version {version} failed: {e}")
+    finally:
+        refresh_lock.release()
+
+
 # **Run the application**
 if __name__ == "__main__":
     app.run_server(debug=True, port=5050)
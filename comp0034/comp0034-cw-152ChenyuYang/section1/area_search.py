@@ -0,0 +1,76 @@
+from collections import defaultdict
+
+# Number of options returned to the dropdown per search
+MAX_RESULTS = 20
+
+
+def _normalize(text):
+    return " ".join(str(text).lower().split())
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class AreaIndex:
+    """Prefix and trigram index over area codes and area names.
+
+    Built once at startup so each dropdown search only touches the areas
+    that share a prefix or trigram with the query, instead of every option.
+    """
+
+    def __init__(self, df_area):
+        df_area = df_area.drop_duplicates(subset="area_code").reset_index(drop=True)
+
+        self.codes = df_area["area_code"].astype(str).tolist()
+        self.names = df_area["area_name"].fillna("").astype(str).tolist()
+        self.position = {code: i for i, code in enumerate(self.codes)}
+
+        self.prefixes = defaultdict(set)
+        self.trigrams = defaultdict(set)
+
+        for i, (code, name) in enumerate(zip(self.codes, self.names)):
+            text = _normalize(f"{code} {name}")
+
+            # **Every prefix of every word, e.g. "e09", "bar", "barnet"**
+            for word in text.split():
+                for end in range(1, len(word) + 1):
+                    self.prefixes[word[:end]].add(i)
+
+            for gram in _trigrams(text):
+                self.trigrams[gram].add(i)
+
+    def option(self, i):
+        label = f"{self.names[i]} ({self.codes[i]})" if self.names[i] else self.codes[i]
+        return {"label": label, "value": self.codes[i]}
+
+    def options_for(self, codes):
+        return [self.option(self.position[c]) for c in codes if c in self.position]
+
+    def search(self, query, limit=MAX_RESULTS):
+        query = _normalize(query or "")
+
+        # **Empty search: first areas in database order**
+        if not query:
+            return [self.option(i) for i in range(min(limit, len(self.codes)))]
+
+        words = query.split()
+
+        # **Prefix match on every query word ranks first**
+        matches = set.intersection(*(self.prefixes.get(w, set()) for w in words))
+        scores = {i: 2.0 for i in matches}
+
+        # **Trigram overlap catches typos and mid-word matches**
+        query_grams = _trigrams(query)
+        counts = defaultdict(int)
+        for gram in query_grams:
+            for i in self.trigrams.get(gram, ()):
+                counts[i] += 1
+        for i, count in counts.items():
+            score = count / len(query_grams)
+            if score >= 0.3:
+                scores[i] = max(scores.get(i, 0.0), score)
+
+        ranked = sorted(scores, key=lambda i: (-scores[i], self.names[i], i))
+        return [self.option(i) for i in ranked[:limit]]
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+import shutil
+import diskcache
+import plotly.io as pio
+
+# Get the directory where figure_store.py is located
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Prerendered figures, one folder per data version
+prerender_dir = os.path.join(BASE_DIR, "prerendered")
+
+# Request counters used to pick the most requested selections
+requests_dir = os.path.join(BASE_DIR, "cache", "requests")
+
+# Selections not requested again for this long are forgotten (seconds)
+REQUEST_EXPIRE = 30 * 24 * 3600
+
+# Most selections counted at once; beyond this the least requested are dropped
+MAX_SELECTIONS = 1000
+
+
+def figure_key(figure_id, args):
+    """Stable key for one figure and the callback arguments that produced it."""
+    payload = json.dumps([figure_id, args], sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def record_request(selection):
+    """Count a dashboard selection so prerender.py can find popular ones."""
+    key = json.dumps(selection)
+
+    with diskcache.Cache(requests_dir) as cache, cache.transact():
+        # Every request pushes the expiry of its selection back
+        cache.set(key, cache.get(key, 0) + 1, expire=REQUEST_EXPIRE)
+
+        if len(cache) > MAX_SELECTIONS:
+            cache.expire()
+            # Trim well below the cap so this does not run on every request
+            counts = sorted((cache.get(k, 0), k) for k in cache.iterkeys())
+            for _, old_key in counts[: len(counts) - MAX_SELECTIONS * 9 // 10]:
+                cache.delete(old_key)
+
+
+def most_requested(n):
+    """Return the ``n`` most requested selections."""
+    with diskcache.Cache(requests_dir) as cache:
+        counts = [(cache.get(key, 0), key) for key in cache.iterkeys()]
+
+    # Expired selections read as 0
+    counts = sorted([c for c in counts if c[0] > 0], reverse=True)
+    return [json.loads(key) for _, key in counts[:n]]
+
+
+def save_figure(version, figure_id, args, fig):
+    version_dir = os.path.join(prerender_dir, version)
+    os.makedirs(version_dir, exist_ok=True)
+
+    path = os.path.join(version_dir, f"{figure_key(figure_id, args)}.json")
+
+    # Write then rename, so a running app never reads a half-written file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(pio.to_json(fig))
+    os.replace(tmp_path, path)
+
+    return path
+
+
+def prune_versions(keep):
+    """Delete the prerendered figures of every data version except ``keep``."""
+    if not os.path.isdir(prerender_dir):
+        return []
+
+    removed = []
+    for version in os.listdir(prerender_dir):
+        version_dir = os.path.join(prerender_dir, version)
+        if version != keep and os.path.isdir(version_dir):
+            shutil.rmtree(version_dir, ignore_errors=True)
+            removed.append(version)
+
+    return removed
+
+
+class FigureStore:
+    """Read-only view of the prerendered figures for one data version.
+
+    Files are looked up on every call, so figures that prerender.py writes
+    after the app has loaded this version are served straight away.
+    """
+
+    def __init__(self, version):
+        self.version_dir = os.path.join(prerender_dir, version)
+
+    def get(self, figure_id, args):
+        """Return the prerendered figure as a dict, or None if missing."""
+        path = os.path.join(self.version_dir, f"{figure_key(figure_id, args)}.json")
+
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
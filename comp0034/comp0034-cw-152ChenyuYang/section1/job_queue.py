@@ -0,0 +1,182 @@
+import os
+from dash import DiskcacheManager
+import diskcache
+
+# Get the directory where job_queue.py is located
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Local disk-based job store (no external broker needed)
+cache_dir = os.path.join(BASE_DIR, "cache")
+
+# How long a finished figure stays in the cache (seconds)
+RESULT_EXPIRE = 3600
+
+# Marks a job whose process is being spawned
+PENDING = "pending"
+
+
+class LocalJobManager(DiskcacheManager):
+    """Diskcache job manager that shares identical in-flight jobs.
+
+    Jobs are keyed by the Dash cache key (callback source + arguments +
+    data version). Every request gets its own job handle instead of the
+    process id. Requests for a key that is already running attach their
+    handle to that process, and the process is only killed once every
+    attached handle has been terminated. Terminating a handle twice (Dash
+    does this on cancel and on completion) has no further effect.
+
+    The job state lives in the on-disk cache, which outlives the server.
+    It is cleared when the manager is created, so pids recorded by an
+    earlier run (which the OS may have reused) are never attached to or
+    killed.
+    """
+
+    def __init__(self, cache=None, cache_by=None, expire=None):
+        super().__init__(cache, cache_by=cache_by, expire=expire)
+        self.clear_job_state()
+
+    def clear_job_state(self):
+        """Forget in-flight jobs, waiters and handles from an earlier run."""
+        suffixes = ("-inflight", "-process", "-waiters")
+
+        with self.handle.transact():
+            for cache_key in list(self.handle.iterkeys()):
+                if not isinstance(cache_key, str):
+                    continue
+                if cache_key.endswith(suffixes) or cache_key.startswith("job-handle-"):
+                    self.handle.delete(cache_key)
+
+    @staticmethod
+    def _inflight_key(key):
+        return f"{key}-inflight"
+
+    @staticmethod
+    def _process_key(key):
+        return f"{key}-process"
+
+    @staticmethod
+    def _waiters_key(key):
+        return f"{key}-waiters"
+
+    @staticmethod
+    def _handle_key(handle):
+        return f"job-handle-{handle}"
+
+    def call_job_fn(self, key, job_fn, args, context):
+        inflight_key = self._inflight_key(key)
+        waiters_key = self._waiters_key(key)
+        handle = self.handle.incr("job-handle-seq")
+
+        with self.handle.transact():
+            self.handle.set(self._handle_key(handle), key, expire=RESULT_EXPIRE)
+
+            # **Finished result already cached: nothing to run**
+            if self.result_ready(key):
+                return handle
+
+            job = self.handle.get(inflight_key)
+            waiters = self.handle.get(waiters_key, set())
+
+            # **Reuse the running (or starting) job for identical requests**
+            if job == PENDING or (job is not None and super().job_running(job)):
+                waiters.add(handle)
+                self.handle.set(waiters_key, waiters, expire=RESULT_EXPIRE)
+                return handle
+
+            # Reserve the key so concurrent identical requests attach to us
+            self.handle.set(inflight_key, PENDING, expire=RESULT_EXPIRE)
+            self.handle.set(waiters_key, {handle}, expire=RESULT_EXPIRE)
+
+        # Spawn outside the transaction so the child never inherits a lock
+        try:
+            job = super().call_job_fn(key, job_fn, args, context)
+        except Exception:
+            self.handle.delete(inflight_key)
+            self.handle.delete(waiters_key)
+            raise
+
+        with self.handle.transact():
+            cancelled = not self.handle.get(waiters_key)
+            if not cancelled:
+                self.handle.set(inflight_key, job, expire=RESULT_EXPIRE)
+                self.handle.set(self._process_key(key), job, expire=RESULT_EXPIRE)
+
+        # **Everyone cancelled while the process was starting**
+        if cancelled:
+            super().terminate_job(job)
+
+        return handle
+
+    def _process_for(self, handle):
+        """Process id (or PENDING) behind a job handle, None if detached."""
+        key = self.handle.get(self._handle_key(int(handle)))
+        if key is None:
+            return None
+        if int(handle) not in self.handle.get(self._waiters_key(key), set()):
+            return None
+        return self.handle.get(self._process_key(key), PENDING)
+
+    def job_running(self, job):
+        pid = self._process_for(job)
+        if pid == PENDING:
+            return True
+        return pid is not None and super().job_running(pid)
+
+    def terminate_unhealthy_job(self, job):
+        pid = self._process_for(job)
+        if pid is None or pid == PENDING or super().job_running(pid):
+            return False
+
+        self.terminate_job(job)
+        return True
+
+    def terminate_job(self, job):
+        if job is None:
+            return
+
+        handle = int(job)
+
+        with self.handle.transact():
+            key = self.handle.get(self._handle_key(handle))
+            if key is None:
+                return
+            self.handle.delete(self._handle_key(handle))
+
+            waiters_key = self._waiters_key(key)
+            waiters = self.handle.get(waiters_key, set())
+            if handle not in waiters:
+                return
+            waiters.discard(handle)
+
+            # **Other requests still wait for this job, keep it alive**
+            if waiters:
+                self.handle.set(waiters_key, waiters, expire=RESULT_EXPIRE)
+                return
+
+            self.handle.delete(waiters_key)
+            self.handle.delete(self._inflight_key(key))
+            pid = self.handle.get(self._process_key(key))
+            self.handle.delete(self._process_key(key))
+
+        # A pending job is killed by its spawner once it sees no waiters
+        if pid is not None:
+            super().terminate_job(pid)
+
+    def get_result(self, key, job):
+        result = super().get_result(key, job)
+
+        # **Finished: new requests read the cached result instead**
+        if result is not self.UNDEFINED:
+            self.handle.delete(self._inflight_key(key))
+
+        return result
+
+
+def create_job_manager(data_version):
+    """Create the background callback manager used by app.py.
+
+    ``data_version`` is a zero-argument function; its value is part of every
+    cache key so figures are recomputed when the database is rebuilt.
+    """
+    cache = diskcache.Cache(cache_dir)
+    return LocalJobManager(cache, cache_by=[data_version], expire=RESULT_EXPIRE)
@@ -0,0 +1,39 @@
+import argparse
+import app
+from figure_store import most_requested, prune_versions, save_figure
+
+# Run after data0035/coursework1/database.py has rebuilt the database:
+#   python section1/prerender.py --top 10
+
+
+def prerender(top=0):
+    data = app.current_data
+
+    # **Default dashboard state first, then the most requested selections**
+    selections = [(data.default_areas, "total", "total")]
+    selections += [tuple(selection) for selection in most_requested(top)]
+
+    count = 0
+    for selection in selections:
+        for figure_id, args in app.figure_args(*selection).items():
+            fig = app.figure_renderers[figure_id](*args, data=data)
+            save_figure(data.version, figure_id, args, fig)
+            count += 1
+
+    print(f"Prerendered {count} figures for data version {data.version}")
+
+    # **Older versions are never served again**
+    removed = prune_versions(data.version)
+    if removed:
+        print(f"Removed prerendered figures of {len(removed)} old data version(s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prerender dashboard figures")
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=0,
+        help="also prerender the N most requested selections",
+    )
+    prerender(parser.parse_args().top)
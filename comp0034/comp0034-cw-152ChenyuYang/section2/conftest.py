@@ -0,0 +1,12 @@
+import os
+import sys
+
+# **Make the app modules and the ETL scripts importable from the unit tests**
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for path in [
+    os.path.join(PROJECT_DIR, "section1"),
+    os.path.join(PROJECT_DIR, "data0035", "coursework1"),
+]:
+    if path not in sys.path:
+        sys.path.insert(0, path)
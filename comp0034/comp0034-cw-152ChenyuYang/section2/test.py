@@ -133,6 +133,50 @@ class TestDashboard:
         except Exception as e:
             pytest.fail(f"Area dropdown test failed: {str(e)}")
 
+    def test_area_search(self):
+        """Test if typing an area name (with a typo) finds and selects the area"""
+        try:
+            dropdown_container = self.wait.until(
+                EC.presence_of_element_located((By.ID, "area-dropdown"))
+            )
+            dropdown_container.click()
+            time.sleep(1)
+
+            search_input = self.driver.find_element(
+                By.CSS_SELECTOR, "#area-dropdown input, .dash-dropdown-search"
+            )
+            search_input.send_keys("Barnt")
+
+            # Options are served by the search callback, so wait for them
+            option_selector = ".VirtualizedSelectOption, .dash-dropdown-option"
+            self.wait.until(
+                lambda driver: any(
+                    "Barnet (E09000003)" in option.text
+                    for option in driver.find_elements(
+                        By.CSS_SELECTOR, option_selector
+                    )
+                )
+            )
+
+            for option in self.driver.find_elements(By.CSS_SELECTOR, option_selector):
+                if "Barnet (E09000003)" in option.text:
+                    option.click()
+                    break
+            time.sleep(2)
+
+            selected_values = [
+                value.text
+                for value in dropdown_container.find_elements(
+                    By.CSS_SELECTOR, ".Select-value-label, .dash-dropdown-value-item"
+                )
+            ]
+            assert any(
+                "Barnet (E09000003)" in value for value in selected_values
+            ), "Barnet should be selected from the search results"
+
+        except Exception as e:
+            pytest.fail(f"Area search test failed: {str(e)}")
+
     def test_data_type_dropdowns(self):
         """Test if the data type dropdowns for line and bar charts work correctly"""
         try:
@@ -203,3 +247,62 @@ class TestDashboard:
 
         except Exception as e:
             pytest.fail(f"Data type dropdowns test failed: {str(e)}")
+
+    def test_trend_options(self):
+        """Test if the trend analytics options can be selected for the line chart"""
+        try:
+            line_dropdown = self.wait.until(
+                EC.presence_of_element_located((By.ID, "line-data-dropdown"))
+            )
+            chart = self.wait.until(
+                EC.presence_of_element_located((By.ID, "waiting-line-chart"))
+            )
+            y_title = chart.find_element(By.CLASS_NAME, "g-ytitle").text
+            assert (
+                y_title == "Total Households"
+            ), "Line chart should start with the total households axis"
+
+            line_dropdown.find_element(By.CLASS_NAME, "Select-control").click()
+            time.sleep(1)
+
+            option_texts = [
+                option.text
+                for option in self.driver.find_elements(
+                    By.CLASS_NAME, "VirtualizedSelectOption"
+                )
+            ]
+            for label in [
+                "3-Year Moving Average",
+                "Compound Annual Growth (%)",
+                "Linear Trend (5-Year Projection)",
+            ]:
+                assert label in option_texts, f"Line chart should offer {label}"
+
+            for option in self.driver.find_elements(
+                By.CLASS_NAME, "VirtualizedSelectOption"
+            ):
+                if option.text == "Linear Trend (5-Year Projection)":
+                    option.click()
+                    break
+            time.sleep(2)
+
+            line_selected = line_dropdown.find_element(
+                By.CLASS_NAME, "Select-value-label"
+            )
+            assert (
+                line_selected.text == "Linear Trend (5-Year Projection)"
+            ), "Line chart should show Linear Trend"
+
+            chart = self.wait.until(
+                EC.presence_of_element_located((By.ID, "waiting-line-chart"))
+            )
+            assert chart.is_displayed(), "waiting-line-chart should remain visible"
+
+            # **The figure itself must be redrawn with the trend data**
+            y_title = chart.find_element(By.CLASS_NAME, "g-ytitle").text
+            assert (
+                y_title == "Linear Trend (5-Year Projection)"
+            ), "Line chart y-axis should show the linear trend"
+
+        except Exception as e:
+            pytest.fail(f"Trend options test failed: {str(e)}")
@@ -0,0 +1,123 @@
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from analytics import (
+    FORECAST_HORIZON,
+    MOVING_AVERAGE_WINDOW,
+    TrendMetrics,
+    build_matrix,
+    compound_growth,
+    linear_trend,
+    moving_average,
+)
+
+YEARS = np.arange(2015, 2022)
+
+# **One row per edge case**
+MATRIX = np.array(
+    [
+        [100, 110, 121, 133.1, 146.41, 161.051, 177.1561],  # steady growth
+        [50, np.nan, 70, np.nan, np.nan, 65, 80],  # gaps
+        [0, 0, 10, 20, 40, 80, 160],  # leading zeros
+        [np.nan, np.nan, np.nan, 42, np.nan, np.nan, np.nan],  # single point
+        [np.nan] * 7,  # no data
+    ]
+)
+
+
+def long_frame(matrix, years, value_col="households_count"):
+    """Long fact table in the shape app.py loads from the database."""
+    rows = [
+        {"area_code": f"E{i:08d}", "year": int(year), value_col: value}
+        for i, row in enumerate(matrix)
+        for year, value in zip(years, row)
+        if not np.isnan(value)
+    ]
+    return pd.DataFrame(rows)
+
+
+def test_moving_average_matches_pandas_rolling():
+    expected = (
+        pd.DataFrame(MATRIX.T)
+        .rolling(MOVING_AVERAGE_WINDOW, min_periods=1)
+        .mean()
+        .to_numpy()
+        .T
+    )
+
+    np.testing.assert_allclose(moving_average(MATRIX), expected, equal_nan=True)
+
+
+def test_linear_trend_matches_polyfit():
+    trend_years, trend = linear_trend(MATRIX, YEARS)
+
+    assert list(trend_years) == list(range(2015, 2022 + FORECAST_HORIZON))
+
+    for row, values in enumerate(MATRIX):
+        valid = ~np.isnan(values)
+        if valid.sum() < 2:
+            assert np.isnan(trend[row]).all()
+            continue
+
+        slope, intercept = np.polyfit(YEARS[valid] - YEARS[0], values[valid], 1)
+        expected = intercept + slope * (trend_years - YEARS[0])
+        np.testing.assert_allclose(trend[row], expected)
+
+
+def test_compound_growth_from_first_positive_value():
+    growth = compound_growth(MATRIX, YEARS)
+
+    # Steady 10% growth
+    np.testing.assert_allclose(growth[0, 1:], 10.0)
+    assert np.isnan(growth[0, 0])
+
+    # Gaps stay NaN, later years grow from the first value
+    expected = ((80 / 50) ** (1 / 6) - 1) * 100
+    assert np.isnan(growth[1, 1])
+    assert growth[1, -1] == pytest.approx(expected)
+
+    # Leading zeros are skipped, growth starts at 2017
+    assert np.isnan(growth[2, :3]).all()
+    assert growth[2, 3] == pytest.approx(100.0)
+    assert growth[2, -1] == pytest.approx(100.0)
+
+    # A single point or no data has no growth
+    assert np.isnan(growth[3]).all()
+    assert np.isnan(growth[4]).all()
+
+
+def test_trend_metrics_frame():
+    df = long_frame(MATRIX, YEARS)
+    metrics = TrendMetrics(df, "households_count")
+
+    frame = metrics.frame("forecast", ["E00000000", "unknown"])
+    assert list(frame.columns) == ["area_code", "year", "households_count"]
+    assert set(frame["area_code"]) == {"E00000000"}
+    assert frame["year"].max() == 2021 + FORECAST_HORIZON
+
+    # Areas without any usable value produce no rows
+    assert metrics.frame("cagr", ["E00000003"]).empty
+
+
+def test_trend_metrics_for_10k_areas_are_fast():
+    rng = np.random.default_rng(0)
+    matrix = rng.uniform(100, 1000, size=(10_000, len(YEARS)))
+    matrix[rng.random(matrix.shape) < 0.05] = np.nan
+    df = long_frame(matrix, YEARS)
+
+    start = time.perf_counter()
+    codes, years, built = build_matrix(df, "households_count")
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    moving_average(built)
+    compound_growth(built, years)
+    linear_trend(built, years)
+    metrics_time = time.perf_counter() - start
+
+    assert built.shape == (10_000, len(YEARS))
+    # About 35 ms for the metrics and 70 ms in total on a laptop; the
+    # bounds leave room for slow CI machines
+    assert metrics_time < 0.5
+    assert build_time + metrics_time < 1.5
@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+from area_search import MAX_RESULTS, AreaIndex
+
+AREAS = [
+    ("E09000001", "City of London"),
+    ("E09000002", "Barking and Dagenham"),
+    ("E09000003", "Barnet"),
+    ("E09000033", "Westminster"),
+    ("E06000014", "York"),
+    ("E08000035", "Leeds"),
+    ("E07000178", "Oxford"),
+    ("E06000023", "Bristol, City of"),
+    ("E08000026", "Coventry"),
+]
+
+
+@pytest.fixture
+def index():
+    return AreaIndex(pd.DataFrame(AREAS, columns=["area_code", "area_name"]))
+
+
+def codes(options):
+    return [option["value"] for option in options]
+
+
+def test_code_prefix(index):
+    found = codes(index.search("e09"))
+
+    # Prefix matches rank first (by name), fuzzy matches follow
+    assert found[:4] == ["E09000002", "E09000003", "E09000001", "E09000033"]
+    assert not any(code.startswith("E09") for code in found[4:])
+    assert codes(index.search("E0900000"))[:3] == ["E09000002", "E09000003", "E09000001"]
+
+
+def test_multi_word_name(index):
+    found = codes(index.search("city of"))
+
+    # Both "City of" areas match every word, so they rank first
+    assert set(found[:2]) == {"E09000001", "E06000023"}
+    assert codes(index.search("city of lon"))[0] == "E09000001"
+
+
+def test_typo(index):
+    assert codes(index.search("Westminstr"))[0] == "E09000033"
+    assert codes(index.search("Barnt"))[0] == "E09000003"
+
+
+@pytest.mark.parametrize("query", [None, "", "   "])
+def test_empty_query_returns_areas_in_database_order(index, query):
+    assert codes(index.search(query, limit=3)) == ["E09000001", "E09000002", "E09000003"]
+
+
+def test_limit(index):
+    assert len(index.search("e0", limit=4)) == 4
+    assert len(index.search("e0")) == min(MAX_RESULTS, len(AREAS))
+    assert index.search("e09", limit=0) == []
+
+
+def test_option_labels(index):
+    assert index.search("barnet")[0] == {"label": "Barnet (E09000003)", "value": "E09000003"}
+    assert codes(index.options_for(["E06000014", "unknown"])) == ["E06000014"]
@@ -0,0 +1,85 @@
+import os
+import plotly.express as px
+import pytest
+import figure_store
+from figure_store import (
+    FigureStore,
+    figure_key,
+    most_requested,
+    prune_versions,
+    record_request,
+    save_figure,
+)
+
+
+@pytest.fixture(autouse=True)
+def store_dirs(tmp_path, monkeypatch):
+    """Keep prerendered figures and request counters out of section1."""
+    monkeypatch.setattr(figure_store, "prerender_dir", str(tmp_path / "prerendered"))
+    monkeypatch.setattr(figure_store, "requests_dir", str(tmp_path / "requests"))
+    return tmp_path
+
+
+def test_figure_key_is_stable():
+    key = figure_key("housing-bar-chart", [["E09000001"], "total"])
+
+    assert key == figure_key("housing-bar-chart", [["E09000001"], "total"])
+    assert key == figure_key("housing-bar-chart", (["E09000001"], "total"))
+    assert key != figure_key("housing-bar-chart", [["E09000001"], "pct_change"])
+    assert key != figure_key("waiting-line-chart", [["E09000001"], "total"])
+    assert figure_key("x", [{"b": 1, "a": 2}]) == figure_key("x", [{"a": 2, "b": 1}])
+
+
+def test_saved_figure_is_served():
+    fig = px.bar(x=[2020, 2021], y=[1, 2], title="Housing Supply Over Time")
+    save_figure("v1", "housing-bar-chart", [["E09000001"], "total"], fig)
+
+    stored = FigureStore("v1").get("housing-bar-chart", [["E09000001"], "total"])
+    assert stored["layout"]["title"]["text"] == "Housing Supply Over Time"
+
+
+def test_missing_figure_returns_none():
+    store = FigureStore("v1")
+
+    assert store.get("housing-map", [["E09000001"]]) is None
+
+
+def test_corrupt_figure_returns_none():
+    args = [["E09000001"]]
+    path = save_figure("v1", "housing-map", args, px.scatter(x=[1], y=[1]))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"data": [')
+
+    assert FigureStore("v1").get("housing-map", args) is None
+
+
+def test_most_requested_ordering():
+    for selection, times in [("a", 1), ("b", 3), ("c", 2)]:
+        for _ in range(times):
+            record_request([[selection], "total", "total"])
+
+    assert most_requested(2) == [[["b"], "total", "total"], [["c"], "total", "total"]]
+    assert most_requested(0) == []
+
+
+def test_request_counters_are_capped(monkeypatch):
+    monkeypatch.setattr(figure_store, "MAX_SELECTIONS", 10)
+
+    for _ in range(5):
+        record_request(["popular"])
+    for i in range(20):
+        record_request([f"rare-{i}"])
+
+    kept = most_requested(100)
+    assert len(kept) <= 10
+    assert kept[0] == ["popular"]
+
+
+def test_old_versions_are_pruned(store_dirs):
+    fig = px.scatter(x=[1], y=[1])
+    for version in ["v1", "v2", "v3"]:
+        save_figure(version, "housing-map", [["E09000001"]], fig)
+
+    assert sorted(prune_versions("v3")) == ["v1", "v2"]
+    assert os.listdir(store_dirs / "prerendered") == ["v3"]
+    assert FigureStore("v3").get("housing-map", [["E09000001"]]) is not None
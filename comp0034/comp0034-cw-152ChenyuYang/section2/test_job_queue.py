@@ -0,0 +1,97 @@
+import time
+import diskcache
+import pytest
+from dash import DiskcacheManager
+from job_queue import LocalJobManager
+
+
+def sleeping_job(key, progress_key, args, context):
+    time.sleep(args)
+
+
+def process_alive(manager, pid):
+    # Ask the stock manager, which takes a pid rather than a job handle
+    return DiskcacheManager.job_running(manager, pid)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Job manager backed by a throwaway cache directory."""
+    cache = diskcache.Cache(str(tmp_path / "cache"))
+    manager = LocalJobManager(cache, cache_by=[lambda: "v1"], expire=60)
+    yield manager
+    cache.close()
+
+
+def test_identical_calls_share_one_process(manager):
+    first = manager.call_job_fn("key", sleeping_job, 5, {})
+    second = manager.call_job_fn("key", sleeping_job, 5, {})
+
+    assert first != second
+    assert manager.handle.get("key-waiters") == {first, second}
+    assert manager.job_running(first) and manager.job_running(second)
+
+    pid = manager.handle.get("key-process")
+    assert process_alive(manager, pid)
+    assert manager.handle.get("key-inflight") == pid
+
+    manager.terminate_job(first)
+    manager.terminate_job(second)
+
+
+def test_terminating_a_handle_twice_keeps_other_waiter_running(manager):
+    first = manager.call_job_fn("key", sleeping_job, 5, {})
+    second = manager.call_job_fn("key", sleeping_job, 5, {})
+    pid = manager.handle.get("key-process")
+
+    manager.terminate_job(first)
+    manager.terminate_job(first)
+
+    assert not manager.job_running(first)
+    assert manager.job_running(second)
+    assert manager.handle.get("key-waiters") == {second}
+    assert manager.handle.get("key-process") == pid
+    assert process_alive(manager, pid)
+
+    manager.terminate_job(second)
+
+
+def test_process_is_killed_once_every_handle_is_terminated(manager):
+    first = manager.call_job_fn("key", sleeping_job, 5, {})
+    second = manager.call_job_fn("key", sleeping_job, 5, {})
+    pid = manager.handle.get("key-process")
+
+    manager.terminate_job(first)
+    manager.terminate_job(second)
+
+    assert not process_alive(manager, pid)
+    for suffix in ["inflight", "process", "waiters"]:
+        assert manager.handle.get(f"key-{suffix}") is None
+
+
+def test_cached_result_does_not_spawn_a_process(manager):
+    manager.handle.set("key", "cached figure")
+
+    handle = manager.call_job_fn("key", sleeping_job, 5, {})
+
+    assert manager.handle.get("key-inflight") is None
+    assert manager.handle.get("key-process") is None
+    assert not manager.job_running(handle)
+    assert manager.get_result("key", handle) == "cached figure"
+
+
+def test_state_from_an_earlier_run_is_cleared(tmp_path):
+    cache = diskcache.Cache(str(tmp_path / "cache"))
+    cache.set("key", "cached figure")
+    cache.set("key-inflight", 12345)
+    cache.set("key-process", 12345)
+    cache.set("key-waiters", {1})
+    cache.set("job-handle-1", "key")
+
+    manager = LocalJobManager(cache, cache_by=[lambda: "v1"], expire=60)
+
+    assert cache.get("key") == "cached figure"
+    for stale_key in ["key-inflight", "key-process", "key-waiters", "job-handle-1"]:
+        assert stale_key not in cache
+    assert not manager.job_running(1)
+    cache.close()
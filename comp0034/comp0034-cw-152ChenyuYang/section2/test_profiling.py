@@ -0,0 +1,81 @@
+import json
+import time
+import pytest
+import profiling
+from profiling import Profiler, parse_args
+
+
+@pytest.fixture(autouse=True)
+def profile_dir(tmp_path, monkeypatch):
+    """Write reports and cProfile dumps to a throwaway directory."""
+    monkeypatch.setattr(profiling, "profile_dir", tmp_path)
+    return tmp_path
+
+
+def test_disabled_profiler_is_a_no_op(profile_dir):
+    profiler = Profiler("script")
+
+    with profiler.stage("load"):
+        pass
+
+    assert profiler.stages == []
+    assert profiler.write_report() is None
+    assert list(profile_dir.iterdir()) == []
+
+
+def test_report_fields(profile_dir):
+    profiler = Profiler("script", enabled=True)
+
+    with profiler.stage("load"):
+        data = bytearray(20 * 1024 * 1024)
+    del data
+
+    report_path = profiler.write_report()
+    assert report_path == profile_dir / "script.json"
+
+    report = json.loads(report_path.read_text())
+    assert report["script"] == "script"
+    assert report["tracemalloc"] is False
+    assert report["cprofile"] is False
+    assert report["process_peak_rss_bytes"] > 0
+
+    (stage,) = report["stages"]
+    assert stage["stage"] == "load"
+    assert stage["wall_time_s"] == report["total_wall_time_s"]
+    assert stage["peak_rss_bytes"] >= max(stage["rss_start_bytes"], stage["rss_end_bytes"])
+    assert "top_allocators" not in stage
+    assert "cprofile" not in stage
+
+
+def test_stage_peak_includes_memory_freed_before_the_stage_ends():
+    profiler = Profiler("script", enabled=True)
+
+    with profiler.stage("spike"):
+        data = bytearray(100 * 1024 * 1024)
+        time.sleep(0.1)
+        del data
+
+    (stage,) = profiler.stages
+    assert stage["peak_rss_bytes"] - stage["rss_end_bytes"] > 50 * 1024 * 1024
+
+
+def test_traced_report_gets_its_own_file(profile_dir):
+    profiler = Profiler("script", enabled=True, cprofile=True, trace_memory=True)
+
+    with profiler.stage("load"):
+        data = [str(i) for i in range(10000)]
+    del data
+
+    report_path = profiler.write_report()
+    assert report_path == profile_dir / "script.memory.json"
+
+    (stage,) = json.loads(report_path.read_text())["stages"]
+    assert stage["traced_peak_bytes"] > 0
+    assert stage["top_allocators"]
+    assert stage["cprofile"] == str(profile_dir / "script.load.prof")
+
+
+def test_detailed_options_imply_profile():
+    assert not parse_args("test", []).profile
+    assert parse_args("test", ["--trace-memory"]).profile
+    assert parse_args("test", ["--cprofile"]).profile
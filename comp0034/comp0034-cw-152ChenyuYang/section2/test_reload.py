@@ -0,0 +1,94 @@
+import shutil
+import sqlite3
+import pytest
+import app
+import database
+
+
+def table_counts(path):
+    with sqlite3.connect(path) as conn:
+        return {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ["Area", "Affordable_Housing_Data", "Waiting_List_Data"]
+        }
+
+
+@pytest.fixture
+def build_paths(tmp_path, monkeypatch):
+    """Point database.py at a throwaway live and staging file."""
+    db_path = tmp_path / "local_authority_housing.db"
+    staging_path = tmp_path / "local_authority_housing.db.staging"
+    monkeypatch.setattr(database, "db_path", db_path)
+    monkeypatch.setattr(database, "staging_path", staging_path)
+    return db_path, staging_path
+
+
+@pytest.fixture
+def live_app(monkeypatch):
+    """Let a test swap app.py's data without leaking it into other tests."""
+    for name in ["db_path", "current_data", "current_layout", "failed_version"]:
+        monkeypatch.setattr(app, name, getattr(app, name))
+    return app
+
+
+def test_build_is_published_with_a_rename(build_paths):
+    db_path, staging_path = build_paths
+
+    database.create_database()
+
+    assert db_path.exists()
+    assert not staging_path.exists()
+    assert all(count > 0 for count in table_counts(db_path).values())
+
+
+def test_failed_build_leaves_the_live_database(build_paths, tmp_path, monkeypatch):
+    db_path, staging_path = build_paths
+    shutil.copy(app.db_path, db_path)
+    before = table_counts(db_path)
+
+    monkeypatch.setattr(database, "file1_path", tmp_path / "missing.xlsx")
+    database.create_database()
+
+    assert table_counts(db_path) == before
+    assert not staging_path.exists()
+
+
+def test_hot_reload_swaps_data_and_layout(live_app, tmp_path):
+    old_data = live_app.current_data
+    old_layout = live_app.current_layout
+    old_dropdown = old_layout["area-dropdown"]
+
+    new_db = tmp_path / "local_authority_housing.db"
+    shutil.copy(live_app.db_path, new_db)
+    live_app.db_path = str(new_db)
+
+    live_app.reload_if_changed()
+
+    assert live_app.current_data is not old_data
+    assert live_app.current_data.version == live_app.data_version()
+    assert live_app.current_layout is not old_layout
+    assert live_app.app.layout() is live_app.current_layout
+
+    # The layout that was being served is never modified
+    assert old_layout["area-dropdown"] is old_dropdown
+    assert old_dropdown.value == old_data.default_areas
+
+
+def test_failed_reload_keeps_serving_the_loaded_version(live_app, tmp_path):
+    old_data = live_app.current_data
+    old_layout = live_app.current_layout
+
+    # A database without the expected tables cannot be loaded
+    broken_db = tmp_path / "broken.db"
+    sqlite3.connect(broken_db).close()
+    live_app.db_path = str(broken_db)
+
+    live_app.reload_if_changed()
+
+    assert live_app.current_data is old_data
+    assert live_app.current_layout is old_layout
+    assert live_app.failed_version == live_app.data_version()
+
+    # The failed version is not retried on every request
+    live_app.reload_if_changed()
+    assert live_app.current_data is old_data